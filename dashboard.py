@@ -0,0 +1,324 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Literal
+
+import httpx
+import numpy as np
+import orjson
+import pandas as pd
+import streamlit as st
+import yfinance as yf
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from yfinance.data import YfData
+
+# Get API key from Streamlit secrets or environment
+TWELVE_DATA_API_KEY = st.secrets.get("TWELVE_DATA_API_KEY", "demo")  # 'demo' for testing
+
+
+@dataclass(frozen=True)
+class Asset:
+    """One dashboard row: a Yahoo futures contract and the spot price it is compared against"""
+    name: str
+    fut_symbol: str
+    spot_symbol: str
+    multiplier: float = 1
+    spot_provider: Literal["yahoo", "twelvedata"] = "yahoo"
+
+    @property
+    def yahoo_symbols(self):
+        if self.spot_provider == "yahoo":
+            return (self.fut_symbol, self.spot_symbol)
+        return (self.fut_symbol,)
+
+
+# ─── ASSET CONFIG ───
+ASSETS = [
+    Asset("Gold", "GC=F", "XAUUSD", spot_provider="twelvedata"),  # Gold Futures vs Real Spot from API
+    Asset("Silver", "SI=F", "SLV"),  # iShares Silver Trust ETF as spot proxy
+    Asset("NAS100", "NQ=F", "^NDX"),
+    Asset("US30", "YM=F", "^DJI"),
+    Asset("SPX500", "ES=F", "^GSPC"),
+    Asset("Oil (WTI)", "CL=F", "USO"),  # United States Oil Fund as spot proxy
+    Asset("Gas (Natural)", "NG=F", "UNG"),  # United States Natural Gas Fund as spot proxy
+]
+
+
+@dataclass
+class Quotes:
+    """Everything fetched for one rerun: daily closes for charts, live prices for the table"""
+    closes: dict
+    prices: dict
+    spots: dict
+    spot_errors: set = field(default_factory=set)  # Twelve Data symbols whose call failed this rerun
+    price_fallbacks: set = field(default_factory=set)  # Yahoo symbols showing the last daily close, not a live price
+
+
+# ─── DATA SOURCES ───
+@st.cache_resource
+def _td_client():
+    """Shared HTTP/2 client so Twelve Data calls reuse (and multiplex over) one keep-alive TLS connection"""
+    return httpx.Client(http2=True, timeout=5.0, headers={"Accept": "application/json"},
+                        limits=httpx.Limits(max_keepalive_connections=20))
+
+class TwelveDataError(Exception):
+    """Twelve Data answered without a price; `level` is how loudly to report it (None = stay quiet)"""
+
+    def __init__(self, message, level="warning"):
+        super().__init__(message)
+        self.level = level
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def get_twelve_data_price(symbol):
+    """Fetch a real-time spot price from Twelve Data API (cached for 10 seconds to avoid rate limits)
+
+    Raises TwelveDataError instead of returning a placeholder, so a failed call is never cached.
+    """
+    url = f"https://api.twelvedata.com/price?symbol={symbol}&apikey={TWELVE_DATA_API_KEY}"
+    response = _td_client().get(url)
+    data = orjson.loads(response.content)
+
+    # Check for API errors
+    if 'code' in data and data['code'] == 403:
+        raise TwelveDataError("⚠️ API Key Error! Please add your Twelve Data API key to Streamlit Secrets", level="error")
+    if 'message' in data:
+        # Don't show rate limit warnings
+        quiet = 'run out of API credits' in data.get('message', '')
+        raise TwelveDataError(f"API Message: {data['message']}", level=None if quiet else "warning")
+    if 'price' in data:
+        return float(data['price'])
+    raise TwelveDataError(f"No price in Twelve Data response for {symbol}")
+
+class YahooDataError(Exception):
+    """Yahoo returned no usable Close data (yfinance logs failures and hands back empty/NaN frames)"""
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_history(symbols, period="5d"):
+    """Fetch daily history for all Yahoo symbols in one batched request (cached for an hour, chart only)
+
+    Raises YahooDataError when no symbol has any Close data, so a failed download is never cached.
+    """
+    hist = yf.download(list(symbols), period=period, group_by="ticker", threads=True, progress=False, auto_adjust=False)
+    if hist.empty or hist.xs("Close", axis=1, level=1).isna().all().all():
+        raise YahooDataError(f"No Close data in batch download for {', '.join(symbols)}")
+    return hist
+
+@st.cache_resource
+def get_ticker(symbol):
+    """Shared Ticker object so Yahoo cookie/crumb setup happens once per symbol, not per rerun"""
+    return yf.Ticker(symbol)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_close(symbol, period="5d"):
+    """Fetch daily closes for a single Yahoo symbol (cached for an hour, chart only)
+
+    Raises YahooDataError when the history is empty, so a failed fetch is retried on the next rerun.
+    """
+    closes = get_ticker(symbol).history(period=period)["Close"].dropna()
+    if closes.empty:
+        raise YahooDataError(f"No Close data for {symbol}")
+    return closes
+
+YAHOO_CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{}"
+
+@st.cache_data(ttl=5, show_spinner=False)
+def last_price(symbol):
+    """Latest price for a Yahoo symbol straight from the chart endpoint's metadata (cached for 5 seconds)
+
+    Goes through yfinance's shared session (cookie/crumb) but skips its history DataFrame pipeline.
+    YfData is an internal yfinance API, which is why requirements.txt pins the yfinance range.
+    """
+    response = YfData().get(YAHOO_CHART_URL.format(symbol), params={"range": "1d", "interval": "1d"}, timeout=5)
+    result = orjson.loads(response.content)["chart"]["result"]
+    return result[0]["meta"].get("regularMarketPrice") if result else None
+
+def fetch(assets):
+    """Fetch chart history, live Yahoo prices and Twelve Data spot prices for all assets
+
+    Both providers are fanned out at once: the Twelve Data and live-price calls run on
+    worker threads while the Yahoo batch download runs here. Workers carry the script
+    context so st.warning/st.error calls inside cached fetchers still render.
+    """
+    syms = list(dict.fromkeys(s for asset in assets for s in asset.yahoo_symbols))
+    spot_syms = list(dict.fromkeys(a.spot_symbol for a in assets if a.spot_provider == "twelvedata"))
+    quotes = Quotes(closes={}, prices={}, spots={})
+
+    with ThreadPoolExecutor(max_workers=2 * len(syms) + len(spot_syms), initializer=add_script_run_ctx,
+                            initargs=(None, get_script_run_ctx())) as pool:
+        spot_jobs = {sym: pool.submit(get_twelve_data_price, sym) for sym in spot_syms}
+        price_jobs = {sym: pool.submit(last_price, sym) for sym in syms}
+
+        # Fetch every Yahoo symbol in a single batched request instead of one per ticker
+        try:
+            hist = fetch_history(tuple(syms))
+            batched = set(hist.columns.get_level_values(0))
+            # yf.download leaves an all-NaN block for a failed ticker, so an empty result counts as missing
+            batch_closes = {sym: hist[sym]["Close"].dropna() for sym in syms if sym in batched}
+            quotes.closes.update({sym: closes for sym, closes in batch_closes.items() if not closes.empty})
+        except Exception as e:
+            st.warning(f"Batch download failed, fetching symbols individually: {str(e)}")
+
+        # Fall back to concurrent per-symbol fetches for anything the batch didn't return
+        pending = {sym: pool.submit(fetch_close, sym) for sym in syms if sym not in quotes.closes}
+        for sym, result in pending.items():
+            try:
+                quotes.closes[sym] = result.result()
+            except Exception as e:
+                quotes.closes[sym] = pd.Series(dtype=float)
+                st.warning(f"Error fetching data for {sym}: {str(e)}")
+
+        # Live prices for the table; fall back to the last daily close if unavailable
+        for sym, result in price_jobs.items():
+            try:
+                quotes.prices[sym] = result.result()
+                reason = None if quotes.prices[sym] is not None else "no price in chart response"
+            except Exception as e:
+                quotes.prices[sym] = None
+                reason = str(e)
+            if quotes.prices[sym] is None and not quotes.closes[sym].empty:
+                quotes.prices[sym] = quotes.closes[sym].iloc[-1]
+                quotes.price_fallbacks.add(sym)
+                st.warning(f"Live price unavailable for {sym}, showing last daily close: {reason}")
+
+        # Twelve Data spot prices; keep showing the last good price while the API is failing
+        last_spots = st.session_state.setdefault("last_spots", {})
+        for sym, result in spot_jobs.items():
+            try:
+                last_spots[sym] = result.result()
+            except TwelveDataError as e:
+                quotes.spot_errors.add(sym)
+                if e.level == "error":
+                    st.error(str(e))
+                elif e.level == "warning":
+                    st.warning(str(e))
+            except Exception as e:
+                quotes.spot_errors.add(sym)
+                st.error(f"Twelve Data API Error ({sym}): {str(e)}")
+            quotes.spots[sym] = last_spots.get(sym)
+
+    return quotes
+
+
+# ─── TABLE ROWS ───
+STATUS_OK = "OK"
+STATUS_NO_DATA = "No data"
+STATUS_API_ERROR = "API Error"
+STATUS_STALE = "API Error (last good spot)"
+STATUS_DELAYED = "Delayed (last daily close)"
+STATUS_ERROR = "ERROR"
+
+def build_row(asset, quotes):
+    """Current (futures, spot, status) for an asset; prices are NaN where data is unavailable
+
+    Rows depend only on the live prices, so a missing chart history does not blank the table.
+    """
+    f_now = quotes.prices.get(asset.fut_symbol)
+
+    # Live spot price from Twelve Data
+    if asset.spot_provider == "twelvedata":
+        s_now = quotes.spots.get(asset.spot_symbol)
+        if asset.spot_symbol in quotes.spot_errors:
+            status = STATUS_API_ERROR if s_now is None else STATUS_STALE
+        else:
+            status = STATUS_OK
+    else:
+        s_now = quotes.prices.get(asset.spot_symbol)
+        if s_now is not None:
+            s_now = s_now * asset.multiplier
+        status = STATUS_OK
+
+    if f_now is None or s_now is None:
+        status = STATUS_NO_DATA if status == STATUS_OK else status
+    elif status == STATUS_OK and not quotes.price_fallbacks.isdisjoint(asset.yahoo_symbols):
+        status = STATUS_DELAYED
+    return np.nan if f_now is None else f_now, np.nan if s_now is None else s_now, status
+
+TABLE_FORMAT = {"Futures": "${:,.2f}", "Spot": "${:,.2f}", "Gap (Fut - Spot)": "{:+.2f}", "Basis %": "{:+.2f}%"}
+
+def _status_style(statuses):
+    """Highlight rows whose fetch failed, so they stand apart from plain missing data"""
+    return ["color: red; font-weight: bold" if s in (STATUS_API_ERROR, STATUS_ERROR)
+            else "color: orange" if s in (STATUS_STALE, STATUS_DELAYED) else "" for s in statuses]
+
+def build_table(names, f_arr, s_arr, statuses):
+    """Summary table kept numeric, with formatting applied once by the Styler (missing values render as N/A)
+
+    Derived columns are computed over the whole futures/spot arrays at once.
+    """
+    gap_arr = f_arr - s_arr
+    basis_pct = gap_arr / s_arr * 100
+    df = pd.DataFrame({"Asset": names, "Futures": f_arr, "Spot": s_arr, "Gap (Fut - Spot)": gap_arr,
+                       "Basis %": basis_pct, "Status": statuses})
+    return df.style.format(TABLE_FORMAT, na_rep="N/A").apply(_status_style, subset=["Status"])
+
+
+# ─── CHARTS ───
+MAX_PLOT_POINTS = 500
+
+def to_plot(series):
+    """Split a series into compact (x, y) arrays for the cached chart builder
+
+    Long series are downsampled to MAX_PLOT_POINTS evenly spaced bars, always keeping the first
+    and latest bar, and values are sent as float32, which plotly>=6 serializes as a compact typed array.
+    """
+    if len(series) > MAX_PLOT_POINTS:
+        series = series.iloc[np.linspace(0, len(series) - 1, MAX_PLOT_POINTS).astype(int)]
+    index = series.index.tz_localize(None) if series.index.tz is not None else series.index
+    return index.values.astype("datetime64[ms]"), series.values.astype("float32")
+
+@st.cache_resource
+def _plt():
+    """Import Plotly once and hand back the constructors the chart builder needs"""
+    import plotly.graph_objects as go
+    return go.Figure, go.Scatter
+
+@st.cache_data(ttl=30, max_entries=64, show_spinner=False)
+def build_fig(title, fut_idx, fut_vals, spot_idx=None, spot_vals=None, live_spot=None):
+    """Build a futures vs spot chart (cached so unchanged series reuse the same figure)
+
+    A live spot price with no history is drawn as a horizontal line instead of a series.
+    """
+    Figure, Scatter = _plt()
+    fig = Figure()
+    fig.add_trace(Scatter(x=fut_idx, y=fut_vals, mode="lines", name="Futures", line=dict(color="blue")))
+    if live_spot is not None:
+        fig.add_hline(y=live_spot, line=dict(color="orange", dash="dash"), annotation_text="Real Spot (Live)")
+    else:
+        fig.add_trace(Scatter(x=spot_idx, y=spot_vals, mode="lines", name="Spot", line=dict(color="orange")))
+    fig.update_layout(title=title, height=300, margin=dict(l=40, r=40, t=40, b=20))
+    return fig
+
+def chart_for(name, sig, build):
+    """Reuse the session's previous figure for an asset while its latest prices are unchanged"""
+    chart_sig = st.session_state.setdefault("chart_sig", {})
+    chart_fig = st.session_state.setdefault("chart_fig", {})
+    if chart_sig.get(name) != sig:
+        chart_fig[name] = build()
+        chart_sig[name] = sig
+    return chart_fig[name]
+
+def build_chart(asset, quotes):
+    """Futures vs spot figure for an asset, or None when there is nothing to plot"""
+    futures = quotes.closes[asset.fut_symbol]
+    if futures.empty:
+        return None
+
+    # For a live-only spot price, draw it as a flat line over the futures history
+    if asset.spot_provider == "twelvedata":
+        spot = quotes.spots[asset.spot_symbol]
+        if spot is None:
+            return None
+        sig = (asset.fut_symbol, futures.iloc[-1], spot, futures.index[-1].value)
+        return chart_for(asset.name, sig, lambda: build_fig(
+            f"{asset.name} (Futures vs Real Spot)", *to_plot(futures), live_spot=spot))
+
+    spot_raw = quotes.closes[asset.spot_symbol]
+    if spot_raw.empty:
+        return None
+
+    # Apply multiplier to spot price
+    spot = spot_raw * asset.multiplier
+    sig = (asset.fut_symbol, futures.iloc[-1], spot.iloc[-1], futures.index[-1].value)
+    return chart_for(asset.name, sig, lambda: build_fig(
+        f"{asset.name} (Futures vs Spot)", *to_plot(futures), *to_plot(spot)))